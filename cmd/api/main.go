@@ -10,6 +10,7 @@ import (
 	"time"
 
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/keepalive"
 
 	"github.com/aiox-platform/aiox/internal/agents"
 	"github.com/aiox-platform/aiox/internal/api"
@@ -136,7 +137,16 @@ func main() {
 	workerRepo := worker.NewRepository(pool)
 	grpcWorkerServer := worker.NewServer(workerPool, workerRepo)
 
-	var grpcServerOpts []grpc.ServerOption
+	// Allow the keepalive pings Python workers send on their long-lived
+	// TaskStream; the default policy (5m) would answer them with GOAWAY.
+	// MinTime stays below the workers' 10s ping interval so network jitter
+	// doesn't accumulate ping strikes.
+	grpcServerOpts := []grpc.ServerOption{
+		grpc.KeepaliveEnforcementPolicy(keepalive.EnforcementPolicy{
+			MinTime:             5 * time.Second,
+			PermitWithoutStream: true,
+		}),
+	}
 	if cfg.GRPC.WorkerAPIKey != "" {
 		grpcServerOpts = append(grpcServerOpts,
 			grpc.UnaryInterceptor(worker.UnaryAuthInterceptor(cfg.GRPC.WorkerAPIKey)),
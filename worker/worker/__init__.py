@@ -0,0 +1,5 @@
+import os
+
+# Use the native upb protobuf backend for worker_pb2. Must be set before
+# google.protobuf is first imported.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
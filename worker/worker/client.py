@@ -1,16 +1,19 @@
 import asyncio
 import json
 import logging
+import resource
+import sys
 import time
-import tracemalloc
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
 
 import grpc
+import httpx
+import orjson
 
 from .config import Config
 from .embedding import EmbeddingService
-from .llm.base import LLMProvider, LLMResponse
-from .llm.openai import OpenAIProvider
-from .llm.anthropic import AnthropicProvider
+from .llm import AnthropicProvider, LLMProvider, LLMResponse, OpenAIProvider
 from .memory import MemoryConfig, MemoryContext
 
 # Import generated protobuf modules
@@ -19,6 +22,94 @@ from . import worker_pb2_grpc
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 tuning for the long-lived TaskStream: keepalive pings detect dead
+# connections during idle periods, and larger windows/message limits keep
+# bursts of task traffic from stalling on flow control. The server's
+# keepalive enforcement policy must permit the ping interval.
+_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 10_000),
+    ("grpc.keepalive_timeout_ms", 20_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.min_time_between_pings_ms", 10_000),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+    ("grpc.max_send_message_length", 64 * 1024 * 1024),
+    ("grpc.http2.lookahead_bytes", 1024 * 1024),
+    ("grpc.use_local_subchannel_pool", 1),
+]
+
+
+@lru_cache(maxsize=1024)
+def _parse_llm_config(data: str) -> tuple[str, str, float, int]:
+    """Parse an agent's llm_config JSON into (provider, model, temperature, max_tokens).
+
+    Agents resend the same config blob on every task, so results are cached.
+    """
+    raw = orjson.loads(data) if data else {}
+    return (
+        raw.get("provider", "openai"),
+        raw.get("model", ""),
+        raw.get("temperature", 0.7),
+        raw.get("max_tokens", 1024),
+    )
+
+
+class _APIKeyMetadata:
+    """Attaches the worker API key to the metadata of outgoing calls.
+
+    grpc.aio.Channel registers an interceptor under only the first
+    interceptor base it matches, so each RPC kind needs its own class.
+    """
+
+    def __init__(self, api_key: str):
+        self._metadata = grpc.aio.Metadata(("x-api-key", api_key))
+
+    def _with_api_key(self, client_call_details):
+        # Call sites pass no metadata of their own, so the prebuilt metadata
+        # is shared; only merge when a caller adds extra entries.
+        if not client_call_details.metadata:
+            return client_call_details._replace(metadata=self._metadata)
+        metadata = grpc.aio.Metadata(*self._metadata, *client_call_details.metadata)
+        return client_call_details._replace(metadata=metadata)
+
+
+class _UnaryAPIKeyInterceptor(_APIKeyMetadata, grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await continuation(self._with_api_key(client_call_details), request)
+
+
+class _StreamAPIKeyInterceptor(_APIKeyMetadata, grpc.aio.StreamStreamClientInterceptor):
+    async def intercept_stream_stream(
+        self, continuation, client_call_details, request_iterator
+    ):
+        return await continuation(
+            self._with_api_key(client_call_details), request_iterator
+        )
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    """Remove and return everything currently in the queue."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def _log_dropped(msgs, reason: str):
+    for msg in msgs:
+        logger.error(
+            "Dropping response for task %s: %s", msg.task_response.request_id, reason
+        )
+
+
+def _peak_rss_mb() -> int:
+    """Peak resident set size of this process in MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    if sys.platform == "darwin":
+        return rss // (1024 * 1024)
+    return rss // 1024
+
 
 class WorkerClient:
     """gRPC client that connects to the AIOX server, receives tasks, and returns results."""
@@ -26,54 +117,104 @@ class WorkerClient:
     def __init__(self, config: Config):
         self.config = config
         self.providers: dict[str, LLMProvider] = {}
+        # Pooled HTTP/2 client for the OpenAI provider so concurrent tasks
+        # reuse connections instead of paying per-request TLS setup. The
+        # timeout matches the SDK default so long completions don't time out.
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=128),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+        )
         self._setup_providers()
-        self.semaphore = asyncio.Semaphore(config.max_concurrent)
-        self.embedding_svc = EmbeddingService()
+        # Explicit admission counter guarded by a Condition (instead of a
+        # Semaphore) so active tasks can be read and the limit resized safely.
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._max = config.max_concurrent
+        self.embedding_svc = EmbeddingService(config)
+
+        # Constant per-process values, built once instead of per message.
+        self._worker_id = config.worker_id
+        self._register_msg = worker_pb2.WorkerMessage(
+            register=worker_pb2.RegisterWorker(
+                worker_id=config.worker_id,
+                max_concurrent=config.max_concurrent,
+                supported_providers=config.supported_providers,
+            )
+        )
+        # Reused by the heartbeat loop, which only updates the dynamic fields.
+        self._heartbeat_msg = worker_pb2.HeartbeatRequest(worker_id=config.worker_id)
 
     def _setup_providers(self):
         if self.config.openai_api_key:
-            self.providers["openai"] = OpenAIProvider(self.config.openai_api_key)
+            self.providers["openai"] = OpenAIProvider(
+                self.config.openai_api_key, http_client=self.http_client
+            )
             logger.info("OpenAI provider configured")
         if self.config.anthropic_api_key:
             self.providers["anthropic"] = AnthropicProvider(self.config.anthropic_api_key)
             logger.info("Anthropic provider configured")
-
-    def _get_provider(self, provider_name: str) -> LLMProvider | None:
-        return self.providers.get(provider_name)
+        # Bound generate methods, so dispatch is a single dict lookup.
+        self._generate_fns: dict[str, Callable[..., Awaitable[LLMResponse]]] = {
+            name: provider.generate for name, provider in self.providers.items()
+        }
+
+    async def set_max_concurrent(self, n: int):
+        """Resize the concurrency limit; waiters re-check the new limit."""
+        async with self._cond:
+            self._max = n
+            self._cond.notify_all()
+
+    async def _acquire_slot(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._max)
+            self._active += 1
+
+    async def _release_slot(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
 
     async def run(self):
         """Main loop: connect, register, process tasks. Reconnects on failure."""
-        while True:
-            try:
-                await self._connect_and_process()
-            except Exception as e:
-                logger.error("Connection error: %s", e)
+        try:
+            while True:
+                try:
+                    await self._connect_and_process()
+                except Exception as e:
+                    logger.error("Connection error: %s", e)
 
-            logger.info(
-                "Reconnecting in %d seconds...", self.config.reconnect_delay
-            )
-            await asyncio.sleep(self.config.reconnect_delay)
+                logger.info(
+                    "Reconnecting in %d seconds...", self.config.reconnect_delay
+                )
+                await asyncio.sleep(self.config.reconnect_delay)
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Release the shared HTTP connection pool."""
+        await self.http_client.aclose()
 
     async def _connect_and_process(self):
-        metadata = []
+        interceptors = []
         if self.config.grpc_api_key:
-            metadata.append(("x-api-key", self.config.grpc_api_key))
-
-        channel = grpc.aio.insecure_channel(self.config.grpc_target)
+            interceptors += [
+                _UnaryAPIKeyInterceptor(self.config.grpc_api_key),
+                _StreamAPIKeyInterceptor(self.config.grpc_api_key),
+            ]
+
+        channel = grpc.aio.insecure_channel(
+            self.config.grpc_target,
+            options=_CHANNEL_OPTIONS,
+            interceptors=interceptors,
+        )
         stub = worker_pb2_grpc.WorkerServiceStub(channel)
 
         try:
-            stream = stub.TaskStream(metadata=metadata)
+            stream = stub.TaskStream()
 
             # Register
-            register_msg = worker_pb2.WorkerMessage(
-                register=worker_pb2.RegisterWorker(
-                    worker_id=self.config.worker_id,
-                    max_concurrent=self.config.max_concurrent,
-                    supported_providers=self.config.supported_providers,
-                )
-            )
-            await stream.write(register_msg)
+            await stream.write(self._register_msg)
 
             # Wait for ack — use stream.read() consistently.
             # NOTE: mixing stream.read() with "async for stream" on the same
@@ -93,34 +234,60 @@ class WorkerClient:
 
             # Start heartbeat task
             heartbeat_task = asyncio.create_task(
-                self._heartbeat_loop(stub, metadata)
+                self._heartbeat_loop(stub)
             )
 
-            # Process incoming tasks using stream.read() (not async for)
+            # Task responses are queued and written back-to-back by a single
+            # writer instead of each task contending for the stream.
+            outbox: asyncio.Queue = asyncio.Queue()
+            writer_task = asyncio.create_task(self._writer_loop(stream, outbox))
+
+            # Process incoming tasks using stream.read() (not async for).
+            # Each read races the writer so a failed write tears the
+            # connection down and run() reconnects.
             try:
                 while True:
-                    server_msg = await stream.read()
+                    read_task = asyncio.ensure_future(stream.read())
+                    await asyncio.wait(
+                        (read_task, writer_task), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if writer_task.done():
+                        read_task.cancel()
+                        raise ConnectionError("task response write failed")
+                    server_msg = read_task.result()
                     if server_msg == grpc.aio.EOF:
                         logger.info("Server closed stream (EOF)")
                         break
                     task_req = server_msg.task_request
                     if task_req and task_req.request_id:
+                        # Take the admission slot before spawning, so a full
+                        # worker stops reading and the server sees backpressure.
+                        await self._acquire_slot()
                         asyncio.create_task(
-                            self._process_task(stream, task_req)
+                            self._process_task(outbox, writer_task, task_req)
                         )
             finally:
-                heartbeat_task.cancel()
-                try:
-                    await heartbeat_task
-                except asyncio.CancelledError:
-                    pass
+                for bg_task in (heartbeat_task, writer_task):
+                    bg_task.cancel()
+                    try:
+                        await bg_task
+                    except asyncio.CancelledError:
+                        pass
+                    except Exception:
+                        pass  # write failure, already logged by the writer
+                _log_dropped(_drain(outbox), "connection closed")
 
         finally:
             await channel.close()
 
-    async def _process_task(self, stream, task_req):
-        """Process a single task with concurrency limiting and memory support."""
-        async with self.semaphore:
+    async def _process_task(
+        self, outbox: asyncio.Queue, writer_task: asyncio.Task, task_req
+    ):
+        """Process a single task with memory support.
+
+        The caller must hold an admission slot; it is released when done.
+        """
+        try:
             logger.info(
                 "Processing task %s for agent %s",
                 task_req.request_id,
@@ -144,7 +311,7 @@ class WorkerClient:
             new_memories = []
             if mem_config.enabled and mem_config.long_term_enabled and not response.error:
                 try:
-                    embedding = self.embedding_svc.embed(task_req.user_message)
+                    embedding = await self.embedding_svc.embed_async(task_req.user_message)
                     new_memories.append(
                         worker_pb2.MemoryEntry(
                             content=task_req.user_message,
@@ -163,7 +330,7 @@ class WorkerClient:
             result_msg = worker_pb2.WorkerMessage(
                 task_response=worker_pb2.TaskResponse(
                     request_id=task_req.request_id,
-                    worker_id=self.config.worker_id,
+                    worker_id=self._worker_id,
                     response_text=response.text,
                     tokens_used=response.tokens_used,
                     duration_ms=response.duration_ms,
@@ -172,7 +339,10 @@ class WorkerClient:
                     new_memories=new_memories,
                 )
             )
-            await stream.write(result_msg)
+            if writer_task.done():
+                _log_dropped([result_msg], "connection closed")
+            else:
+                outbox.put_nowait(result_msg)
 
             logger.info(
                 "Task %s completed: %d tokens, %dms, %d new memories",
@@ -181,23 +351,22 @@ class WorkerClient:
                 response.duration_ms,
                 len(new_memories),
             )
+        finally:
+            await self._release_slot()
 
     async def _call_llm(
         self, task_req, messages: list[dict] | None = None
     ) -> LLMResponse:
         """Call the appropriate LLM provider based on agent's llm_config."""
         try:
-            llm_config = json.loads(task_req.llm_config_json) if task_req.llm_config_json else {}
-        except json.JSONDecodeError:
-            llm_config = {}
-
-        provider_name = llm_config.get("provider", "openai")
-        model = llm_config.get("model", "")
-        temperature = llm_config.get("temperature", 0.7)
-        max_tokens = llm_config.get("max_tokens", 1024)
+            provider_name, model, temperature, max_tokens = _parse_llm_config(
+                task_req.llm_config_json
+            )
+        except orjson.JSONDecodeError:
+            provider_name, model, temperature, max_tokens = _parse_llm_config("")
 
-        provider = self._get_provider(provider_name)
-        if provider is None:
+        generate = self._generate_fns.get(provider_name)
+        if generate is None:
             return LLMResponse(
                 text="",
                 tokens_used=0,
@@ -206,7 +375,7 @@ class WorkerClient:
                 error=f"LLM provider '{provider_name}' not configured on this worker",
             )
 
-        return await provider.generate(
+        return await generate(
             system_prompt=task_req.system_prompt,
             user_message=task_req.user_message,
             model=model,
@@ -215,23 +384,34 @@ class WorkerClient:
             messages=messages,
         )
 
-    async def _heartbeat_loop(self, stub, metadata):
+    async def _heartbeat_loop(self, stub):
         """Periodically send heartbeat to the server."""
         while True:
             await asyncio.sleep(self.config.heartbeat_interval)
             try:
-                mem_mb = 0
-                if tracemalloc.is_started():
-                    current, _ = tracemalloc.get_traced_memory()
-                    mem_mb = current // (1024 * 1024)
-
-                await stub.Heartbeat(
-                    worker_pb2.HeartbeatRequest(
-                        worker_id=self.config.worker_id,
-                        active_tasks=self.config.max_concurrent - self.semaphore._value,
-                        memory_usage_mb=mem_mb,
-                    ),
-                    metadata=metadata,
-                )
+                heartbeat = self._heartbeat_msg
+                heartbeat.active_tasks = self._active
+                heartbeat.memory_usage_mb = _peak_rss_mb()
+
+                await stub.Heartbeat(heartbeat)
             except Exception as e:
                 logger.warning("Heartbeat failed: %s", e)
+
+    async def _writer_loop(self, stream, outbox: asyncio.Queue):
+        """Write queued messages to the stream, draining all pending per wake.
+
+        On a failed write, logs every undelivered response and re-raises.
+        """
+        while True:
+            batch = [await outbox.get()]
+            batch.extend(_drain(outbox))
+            for i, msg in enumerate(batch):
+                try:
+                    await stream.write(msg)
+                except asyncio.CancelledError:
+                    _log_dropped(batch[i:], "connection closed")
+                    raise
+                except Exception as e:
+                    logger.error("Stream write failed: %s", e)
+                    _log_dropped(batch[i:] + _drain(outbox), "stream write failed")
+                    raise
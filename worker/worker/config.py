@@ -1,33 +1,51 @@
 import os
+from dataclasses import dataclass, field
 
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Worker configuration loaded from environment variables."""
-
-    def __init__(self):
-        self.worker_id = os.getenv("WORKER_ID", f"worker-{os.getpid()}")
-        self.grpc_host = os.getenv("GRPC_HOST", "localhost")
-        self.grpc_port = int(os.getenv("GRPC_PORT", "50051"))
-        self.grpc_api_key = os.getenv("GRPC_WORKER_API_KEY", "")
-        self.max_concurrent = int(os.getenv("MAX_CONCURRENT", "4"))
-        self.heartbeat_interval = int(os.getenv("HEARTBEAT_INTERVAL", "30"))
-        self.reconnect_delay = int(os.getenv("RECONNECT_DELAY", "5"))
-
-        # LLM API keys
-        self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
-        self.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-
-    @property
-    def grpc_target(self) -> str:
-        return f"{self.grpc_host}:{self.grpc_port}"
-
-    @property
-    def supported_providers(self) -> list[str]:
+    """Worker configuration; build it from the environment with from_env()."""
+
+    worker_id: str
+    grpc_host: str = "localhost"
+    grpc_port: int = 50051
+    grpc_api_key: str = field(default="", repr=False)
+    max_concurrent: int = 4
+    heartbeat_interval: int = 30
+    reconnect_delay: int = 5
+
+    # LLM API keys
+    openai_api_key: str = field(default="", repr=False)
+    anthropic_api_key: str = field(default="", repr=False)
+    ollama_base_url: str = "http://localhost:11434"
+
+    # Derived once in __post_init__
+    grpc_target: str = field(init=False)
+    supported_providers: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
         providers = []
         if self.openai_api_key:
             providers.append("openai")
         if self.anthropic_api_key:
             providers.append("anthropic")
         providers.append("ollama")  # always available (local)
-        return providers
+
+        object.__setattr__(self, "grpc_target", f"{self.grpc_host}:{self.grpc_port}")
+        object.__setattr__(self, "supported_providers", tuple(providers))
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Load the configuration from environment variables."""
+        return cls(
+            worker_id=os.getenv("WORKER_ID", f"worker-{os.getpid()}"),
+            grpc_host=os.getenv("GRPC_HOST", "localhost"),
+            grpc_port=int(os.getenv("GRPC_PORT", "50051")),
+            grpc_api_key=os.getenv("GRPC_WORKER_API_KEY", ""),
+            max_concurrent=int(os.getenv("MAX_CONCURRENT", "4")),
+            heartbeat_interval=int(os.getenv("HEARTBEAT_INTERVAL", "30")),
+            reconnect_delay=int(os.getenv("RECONNECT_DELAY", "5")),
+            openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY", ""),
+            ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        )
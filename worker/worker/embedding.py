@@ -1,18 +1,41 @@
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 
+import torch
 from sentence_transformers import SentenceTransformer
 
+from .config import Config
+
 logger = logging.getLogger(__name__)
 
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# How long embed_async() waits to collect concurrent requests into one batch.
+BATCH_WINDOW_SEC = 0.005
+BATCH_SIZE = 64
+
 
 class EmbeddingService:
     """Generates 384-dim embeddings using sentence-transformers."""
 
-    def __init__(self):
+    def __init__(self, config: Config):
+        # Inference runs on one dedicated thread so it never blocks the event
+        # loop; leave some cores free for the asyncio thread and task work.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) - config.max_concurrent))
+
         logger.info("Loading embedding model: %s", MODEL_NAME)
-        self.model = SentenceTransformer(MODEL_NAME)
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        # INT8 dynamic quantization of the Linear layers: roughly halves
+        # memory bandwidth and uses VNNI int8 kernels on modern CPUs, at the
+        # cost of a negligible drift in cosine similarity.
+        self.model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
         logger.info("Embedding model loaded")
 
     def embed(self, text: str) -> list[float]:
@@ -22,5 +45,44 @@ class EmbeddingService:
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts."""
-        embeddings = self.model.encode(texts, normalize_embeddings=True)
-        return [e.tolist() for e in embeddings]
+        embeddings = self.model.encode(
+            texts,
+            batch_size=BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        # One tolist() on the 2D array builds the nested lists in C.
+        return embeddings.tolist()
+
+    async def embed_async(self, text: str) -> list[float]:
+        """Generate an embedding off the event loop.
+
+        Concurrent calls are coalesced into one forward pass on the embedding
+        thread.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((text, fut))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+        return await fut
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(BATCH_WINDOW_SEC)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.embed_batch, texts
+            )
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut), embedding in zip(batch, embeddings):
+            if not fut.done():
+                fut.set_result(embedding)
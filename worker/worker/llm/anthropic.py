@@ -12,6 +12,8 @@ class AnthropicProvider(LLMProvider):
     """Anthropic messages API provider."""
 
     def __init__(self, api_key: str):
+        # Uses the SDK's own connection pool: newer anthropic releases are
+        # built on httpx2 and reject an httpx.AsyncClient as http_client.
         self.client = AsyncAnthropic(api_key=api_key)
 
     async def generate(
@@ -26,19 +28,20 @@ class AnthropicProvider(LLMProvider):
         if not model:
             model = "claude-sonnet-4-20250514"
 
-        # For Anthropic, extract system from messages[0] if full messages provided
+        # For Anthropic, extract system from messages[0] if full messages provided.
+        # MemoryContext.build_messages_for_llm emits a single system message
+        # first, so there is no need to scan the whole list.
         system = system_prompt
         chat_messages = [{"role": "user", "content": user_message}]
         if messages is not None:
-            system = ""
-            chat_messages = []
-            for msg in messages:
-                if msg["role"] == "system":
-                    system = msg["content"]
-                else:
-                    chat_messages.append(msg)
+            if messages and messages[0]["role"] == "system":
+                system = messages[0]["content"]
+                chat_messages = messages[1:]
+            else:
+                system = ""
+                chat_messages = messages
 
-        start = time.monotonic()
+        start = time.perf_counter_ns()
         try:
             response = await self.client.messages.create(
                 model=model,
@@ -47,7 +50,7 @@ class AnthropicProvider(LLMProvider):
                 messages=chat_messages,
                 temperature=temperature,
             )
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
 
             tokens = 0
             if response.usage:
@@ -65,7 +68,7 @@ class AnthropicProvider(LLMProvider):
                 duration_ms=duration_ms,
             )
         except Exception as e:
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
             logger.error("Anthropic error: %s", e)
             return LLMResponse(
                 text="",
@@ -1,8 +1,7 @@
-from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Response from an LLM provider."""
     text: str
@@ -12,10 +11,9 @@ class LLMResponse:
     error: str = ""
 
 
-class LLMProvider(ABC):
-    """Abstract base class for LLM providers."""
+class LLMProvider:
+    """Base class for LLM providers."""
 
-    @abstractmethod
     async def generate(
         self,
         system_prompt: str,
@@ -30,4 +28,4 @@ class LLMProvider(ABC):
         If `messages` is provided, use the full messages array (with conversation
         history and memory context) instead of just system_prompt + user_message.
         """
-        ...
+        raise NotImplementedError
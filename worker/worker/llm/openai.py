@@ -1,6 +1,7 @@
 import time
 import logging
 
+import httpx
 from openai import AsyncOpenAI
 
 from .base import LLMProvider, LLMResponse
@@ -11,8 +12,8 @@ logger = logging.getLogger(__name__)
 class OpenAIProvider(LLMProvider):
     """OpenAI chat completions provider."""
 
-    def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient | None = None):
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
 
     async def generate(
         self,
@@ -33,7 +34,7 @@ class OpenAIProvider(LLMProvider):
                 {"role": "user", "content": user_message},
             ]
 
-        start = time.monotonic()
+        start = time.perf_counter_ns()
         try:
             response = await self.client.chat.completions.create(
                 model=model,
@@ -41,7 +42,7 @@ class OpenAIProvider(LLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
 
             tokens = 0
             if response.usage:
@@ -56,7 +57,7 @@ class OpenAIProvider(LLMProvider):
                 duration_ms=duration_ms,
             )
         except Exception as e:
-            duration_ms = int((time.monotonic() - start) * 1000)
+            duration_ms = (time.perf_counter_ns() - start) // 1_000_000
             logger.error("OpenAI error: %s", e)
             return LLMResponse(
                 text="",
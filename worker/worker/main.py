@@ -1,6 +1,7 @@
 import asyncio
 import logging
-import tracemalloc
+
+from google.protobuf.internal import api_implementation
 
 from .config import Config
 from .client import WorkerClient
@@ -11,14 +12,18 @@ def main():
         level=logging.INFO,
         format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
     )
-    tracemalloc.start()
 
-    config = Config()
+    config = Config.from_env()
     logger = logging.getLogger(__name__)
     logger.info("Starting AIOX worker: %s", config.worker_id)
     logger.info("gRPC target: %s", config.grpc_target)
     logger.info("Supported providers: %s", config.supported_providers)
     logger.info("Max concurrent tasks: %d", config.max_concurrent)
+    if api_implementation.Type() != "upb":
+        logger.warning(
+            "Protobuf is using the %s backend; expected upb",
+            api_implementation.Type(),
+        )
 
     client = WorkerClient(config)
     asyncio.run(client.run())
@@ -1,25 +1,27 @@
-import json
 import logging
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationEntry:
     role: str
     content: str
     timestamp: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RelevantMemory:
     content: str
     memory_type: str = "long_term"
     similarity: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryContext:
     recent_messages: list[ConversationEntry] = field(default_factory=list)
     relevant_memories: list[RelevantMemory] = field(default_factory=list)
@@ -30,26 +32,34 @@ class MemoryContext:
         if not data:
             return cls()
         try:
-            raw = json.loads(data)
-        except json.JSONDecodeError:
+            raw = orjson.loads(data)
+        except orjson.JSONDecodeError:
             logger.warning("Failed to parse memory context JSON")
             return cls()
 
         recent = []
-        for msg in raw.get("recent_messages") or []:
-            recent.append(ConversationEntry(
-                role=msg.get("role", "user"),
-                content=msg.get("content", ""),
-                timestamp=msg.get("timestamp", ""),
-            ))
+        raw_recent = raw.get("recent_messages")
+        if raw_recent:
+            recent = [
+                ConversationEntry(
+                    msg.get("role", "user"),
+                    msg.get("content", ""),
+                    msg.get("timestamp", ""),
+                )
+                for msg in raw_recent
+            ]
 
         memories = []
-        for mem in raw.get("relevant_memories") or []:
-            memories.append(RelevantMemory(
-                content=mem.get("content", ""),
-                memory_type=mem.get("memory_type", "long_term"),
-                similarity=mem.get("similarity", 0.0),
-            ))
+        raw_memories = raw.get("relevant_memories")
+        if raw_memories:
+            memories = [
+                RelevantMemory(
+                    mem.get("content", ""),
+                    mem.get("memory_type", "long_term"),
+                    mem.get("similarity", 0.0),
+                )
+                for mem in raw_memories
+            ]
 
         return cls(recent_messages=recent, relevant_memories=memories)
 
@@ -66,24 +76,22 @@ class MemoryContext:
         # Build system content with relevant memories
         system_content = system_prompt
         if self.relevant_memories:
-            memory_section = "\n\n--- Relevant memories from past interactions ---"
-            for mem in self.relevant_memories:
-                memory_section += f"\n[{mem.memory_type}] {mem.content}"
-            system_content += memory_section
-
-        messages = [{"role": "system", "content": system_content}]
-
-        # Add recent conversation history
-        for entry in self.recent_messages:
-            messages.append({"role": entry.role, "content": entry.content})
-
-        # Add current user message
-        messages.append({"role": "user", "content": user_message})
-
-        return messages
-
-
-@dataclass
+            memory_lines = "".join(
+                f"\n[{mem.memory_type}] {mem.content}" for mem in self.relevant_memories
+            )
+            system_content += (
+                "\n\n--- Relevant memories from past interactions ---" + memory_lines
+            )
+
+        # System message, recent conversation history, current user message
+        return [
+            {"role": "system", "content": system_content},
+            *({"role": entry.role, "content": entry.content} for entry in self.recent_messages),
+            {"role": "user", "content": user_message},
+        ]
+
+
+@dataclass(frozen=True, slots=True)
 class MemoryConfig:
     enabled: bool = False
     short_term_enabled: bool = True
@@ -99,15 +107,21 @@ class MemoryConfig:
         if not data:
             return cls()
         try:
-            raw = json.loads(data)
-        except json.JSONDecodeError:
+            return _parse_memory_config(data)
+        except orjson.JSONDecodeError:
             return cls()
-        return cls(
-            enabled=raw.get("enabled", False),
-            short_term_enabled=raw.get("short_term_enabled", True),
-            long_term_enabled=raw.get("long_term_enabled", True),
-            max_short_term_msgs=raw.get("max_short_term_msgs", 20),
-            short_term_ttl_sec=raw.get("short_term_ttl_sec", 3600),
-            max_long_term_results=raw.get("max_long_term_results", 5),
-            similarity_threshold=raw.get("similarity_threshold", 0.7),
-        )
+
+
+@lru_cache(maxsize=1024)
+def _parse_memory_config(data: str) -> MemoryConfig:
+    """Cached: returns a shared frozen instance."""
+    raw = orjson.loads(data)
+    return MemoryConfig(
+        enabled=raw.get("enabled", False),
+        short_term_enabled=raw.get("short_term_enabled", True),
+        long_term_enabled=raw.get("long_term_enabled", True),
+        max_short_term_msgs=raw.get("max_short_term_msgs", 20),
+        short_term_ttl_sec=raw.get("short_term_ttl_sec", 3600),
+        max_long_term_results=raw.get("max_long_term_results", 5),
+        similarity_threshold=raw.get("similarity_threshold", 0.7),
+    )